@@ -5,7 +5,6 @@ from callbacks import register_callbacks
 from data_helper import load_world_cup_data, add_continent_column, get_country_iso_mapping
 
 # load data
-print("--- App Startup: Loading FIFA World Cup Data from local CSVs ---")
 world_cup_overview_df, matches_df, players_df, all_teams = load_world_cup_data()
 country_iso_map = get_country_iso_mapping()
 
@@ -17,7 +16,8 @@ if world_cup_overview_df is not None:
 if world_cup_overview_df is None or matches_df is None or players_df is None:
     print("FATAL ERROR: Failed to load all World Cup data from CSVs. Please check if files exist and are correctly formatted.")
     # Initialize empty DataFrames to prevent further errors if data loading failed
-    world_cup_overview_df = pd.DataFrame(columns=['Year', 'Host', 'Winner', 'Runners-Up', 'Third', 'Fourth', 'Goals Scored', 'Qualified Teams', 'Matches Played', 'Attendance'])
+    # Same columns as the loaded overview (plus Continent), since register_callbacks precomputes from them
+    world_cup_overview_df = pd.DataFrame(columns=['Year', 'Country', 'Winner', 'Runners-Up', 'Third', 'Fourth', 'GoalsScored', 'QualifiedTeams', 'MatchesPlayed', 'Attendance', 'Continent'])
     matches_df = pd.DataFrame(columns=['Year', 'Datetime', 'Stage', 'Stadium', 'City', 'Home Team Name', 'Away Team Name', 'Home Team Goals', 'Away Team Goals', 'Win conditions', 'Attendance', 'Half-time Home Goals', 'Half-time Away Goals', 'Referee', 'Assistant 1', 'Assistant 2', 'Round', 'MatchID', 'Home Team Initials', 'Away Team Initials'])
     players_df = pd.DataFrame(columns=['RoundID', 'MatchID', 'Team Initials', 'Player Name', 'Event'])
 
@@ -1,8 +1,21 @@
-from dash import Output, Input, html, State, no_update, callback_context, dcc
+from functools import lru_cache
+from dash import Output, Input, html, State, no_update, callback_context, dcc, Patch
 import plotly.express as px
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-from data_helper import get_flag_url
+from data_helper import get_flag_url, flag_urls_for
+
+def flag_events(events, pattern):
+    """
+    Returns a boolean array marking which events match the regex pattern.
+    The regex runs once per distinct Event string (via category codes)
+    instead of once per row; missing events are never flagged.
+    """
+    events = events.astype('category')
+    # Code -1 (NaN) indexes the trailing False.
+    lookup = np.append(np.asarray(events.cat.categories.str.contains(pattern), dtype=bool), False)
+    return lookup[events.cat.codes.to_numpy()]
 
 def create_leaderboard_table(df, metric_col):
     """Creates a Dash HTML table for a leaderboard."""
@@ -10,63 +23,94 @@ def create_leaderboard_table(df, metric_col):
         return html.P(f"No {metric_col.lower()} recorded.", style={"color":"#7f8c8d"})
     
     header = html.Thead(html.Tr([html.Th("Player"), html.Th("Team"), html.Th(metric_col)]))
-    rows = [html.Tr([html.Td(row['Player Name']), html.Td(row['Team Initials']), html.Td(row[metric_col], style={'fontWeight': 'bold'})]) for _, row in df.iterrows()]
+    rows = [html.Tr([html.Td(player), html.Td(team), html.Td(metric, style={'fontWeight': 'bold'})]) for player, team, metric in df[['Player Name', 'Team Initials', metric_col]].itertuples(index=False, name=None)]
     return html.Table([header, html.Tbody(rows)], className="table table-sm table-striped mt-3")
 
+# --- MAP STATUS SETUP ---
+# Order of importance for each status (least to most important).
+MAP_STATUS_ORDER = [
+    'Participated Historically', 
+    'Active Participant', 
+    'Third Place', 
+    'Runner-Up', 
+    'Winner'
+]
+MAP_STATUS_COLORS = {
+    'Participated Historically': '#d4e6f1',
+    'Active Participant': '#2e86c1',
+    'Winner': 'gold',
+    'Runner-Up': 'silver',
+    'Third Place': '#cd7f32'
+}
+MAP_STATUS_RANK = {status: rank for rank, status in enumerate(MAP_STATUS_ORDER)}
+# Legend shows the most important status first.
+MAP_LEGEND_ORDER = {"status": MAP_STATUS_ORDER[::-1]}
+
+# Match result badge text/colour, indexed by sign(team goals - opponent goals) + 1.
+MATCH_RESULT_LABELS = np.array(["L", "D", "W"])
+MATCH_RESULT_COLORS = np.array(["#dc3545", "#6c757d", "#28a745"])
+
+# Shared styles for the match journey table rows and its header.
+MATCH_FLAG_STYLE = {"height": "16px", "marginRight": "8px"}
+TEAM_HEADER_FLAG_STYLE = {"height": "24px", "marginRight": "8px", "verticalAlign": "middle"}
+SCORE_CELL_STYLE = {"fontWeight": "bold", "textAlign": "center"}
+RESULT_BADGE_STYLES = {
+    color: {"backgroundColor": color, "color": "white", "padding": "3px 10px", "borderRadius": "6px", "fontWeight": "bold", "fontSize": "12px"}
+    for color in MATCH_RESULT_COLORS.tolist()
+}
+
+# --- STATIC PANEL STATES ---
+# Placeholders and show/hide styles returned by the detail callbacks; they
+# never change, so they are built once instead of on every click.
+INITIAL_TOURNAMENT_SUMMARY = html.P("Click on a tournament to see details.", style={"color":"#7f8c8d"})
+INITIAL_TEAM_SUMMARY = html.P("Select a team to see their performance.", style={"color":"#7f8c8d"})
+CLEAR_BUTTON_HIDDEN_STYLE = {'display': 'none'}
+CLEAR_BUTTON_VISIBLE_STYLE = {'float': 'right', 'display': 'block', 'marginBottom': '10px'}
+H2H_PANEL_HIDDEN_STYLE = {'display': 'none'}
+H2H_PANEL_VISIBLE_STYLE = {'display': 'block', "border": "1px solid #d5dbdb", "padding": "20px", "borderRadius": "8px", "backgroundColor": "#ffffff", "boxShadow": "0 4px 8px rgba(0,0,0,0.05)", "marginBottom": "20px"}
+
+# Hover text shared by both overview data traces.
+OVERVIEW_HOVERTEMPLATE = "<b>%{customdata[1]} %{x}</b><br>Winner: %{customdata[2]}<br>Continent: %{customdata[4]}<br>Goals: %{y}<br>Attendance: %{customdata[3]:,}<extra></extra>"
+
 def create_map_figure(all_teams_list, iso_map, teams_to_highlight=None, winner=None, runner_up=None, third_place=None):
     """
     Creates a Plotly Express choropleth map figure with a consolidated status
     for countries with multiple teams (like the UK).
     """
-    all_teams_df = pd.DataFrame(all_teams_list, columns=['country'])
-    all_teams_df['iso_alpha'] = all_teams_df['country'].map(iso_map)
-    all_teams_df['status'] = 'Participated Historically'
-    
-    # Assign statuses as before
-    if teams_to_highlight:
-        all_teams_df.loc[all_teams_df['country'].isin(teams_to_highlight), 'status'] = 'Active Participant'
-    if third_place:
-        all_teams_df.loc[all_teams_df['country'] == third_place, 'status'] = 'Third Place'
-    if runner_up:
-        all_teams_df.loc[all_teams_df['country'] == runner_up, 'status'] = 'Runner-Up'
-    if winner:
-        all_teams_df.loc[all_teams_df['country'] == winner, 'status'] = 'Winner'
-
-    # --- NEW CONSOLIDATION LOGIC TO FIX THE UK BUG ---
-    # 1. Define the order of importance for each status.
-    status_order = [
-        'Participated Historically', 
-        'Active Participant', 
-        'Third Place', 
-        'Runner-Up', 
-        'Winner'
-    ]
-    # 2. Convert the 'status' column to an ordered Categorical data type.
-    # This teaches pandas the hierarchy of our statuses.
-    all_teams_df['status'] = pd.Categorical(all_teams_df['status'], categories=status_order, ordered=True)
-
-    # 3. Sort the DataFrame first by ISO code, then by the ranked status.
-    # This brings the most important status for each country to the end of its group.
-    all_teams_df = all_teams_df.sort_values(by=['iso_alpha', 'status'])
-
-    # 4. Drop duplicate ISO codes, keeping only the LAST one.
-    # Because we sorted, the 'last' one is guaranteed to be the highest-ranking status.
-    map_df = all_teams_df.drop_duplicates(subset='iso_alpha', keep='last')
-    # --- END OF NEW LOGIC ---
+    # Assign statuses as before, lowest priority first so later ones win
+    status_by_country = dict.fromkeys(all_teams_list, 'Participated Historically')
+    for country in teams_to_highlight or ():
+        if country in status_by_country:
+            status_by_country[country] = 'Active Participant'
+    for status, country in (('Third Place', third_place), ('Runner-Up', runner_up), ('Winner', winner)):
+        if country in status_by_country:
+            status_by_country[country] = status
+
+    # --- CONSOLIDATION LOGIC TO FIX THE UK BUG ---
+    # Several teams can share one ISO code (e.g. the UK home nations); keep
+    # the highest-ranked status per code (the later team wins ties), in one
+    # pass over the teams instead of sort + drop_duplicates.
+    best_by_iso = {}
+    for country, status in status_by_country.items():
+        iso = iso_map.get(country)
+        current = best_by_iso.get(iso)
+        if current is None or MAP_STATUS_RANK[status] >= MAP_STATUS_RANK[current[1]]:
+            best_by_iso[iso] = (country, status)
+
+    # Rows ordered by ISO code, unmapped teams last.
+    map_df = pd.DataFrame(
+        [(country, iso, status) for iso, (country, status) in sorted(best_by_iso.items(), key=lambda item: (item[0] is None, item[0] or ''))],
+        columns=['country', 'iso_alpha', 'status']
+    )
+    # --- END OF CONSOLIDATION LOGIC ---
 
     fig = px.choropleth(
         map_df,  # Use the new, cleaned DataFrame for plotting
         locations="iso_alpha",
         color="status",
         hover_name="country",
-        color_discrete_map={
-            'Participated Historically': '#d4e6f1',
-            'Active Participant': '#2e86c1',
-            'Winner': 'gold',
-            'Runner-Up': 'silver',
-            'Third Place': '#cd7f32'
-        },
-        category_orders={"status": ["Winner", "Runner-Up", "Third Place", "Active Participant", "Participated Historically"]},
+        color_discrete_map=MAP_STATUS_COLORS,
+        category_orders=MAP_LEGEND_ORDER,
         projection="natural earth"
     )
     fig.update_layout(
@@ -94,74 +138,274 @@ def register_callbacks(
     country_iso_map: dict
 ):
 
-    # --- CALLBACK 1 (No changes) ---
+    # --- EVENT FLAGS ---
+    # Goal/card markers per player event, computed once so the callbacks sum
+    # booleans instead of re-running str.contains on the Event strings.
+    players_df = players_df.assign(
+        is_goal=flag_events(players_df['Event'], 'G|P'),
+        is_yellow=flag_events(players_df['Event'], 'Y'),
+        is_red=flag_events(players_df['Event'], 'R'),
+    )
+
+    # --- PRECOMPUTED FIGURES ---
+    # The default map (no tournament selected) only depends on static data,
+    # so it is built once here instead of on every clear/initial load.
+    # Cached figures are stored as plain dicts so Dash can serialize them
+    # directly, without Figure.to_plotly_json() deep-copying them per request.
+    default_map_fig = create_map_figure(all_teams, country_iso_map).to_dict()
+
+    # Same for the all-time Golden Boot leaderboard shown in the default state.
+    all_goals = players_df[players_df['is_goal']]
+    all_top_scorers = all_goals[['Player Name', 'Team Initials']].value_counts().reset_index(name='Goals').head(10)
+    all_time_boot_table = create_leaderboard_table(all_top_scorers, 'Goals')
+
+    # --- PRECOMPUTED LOOKUPS ---
+    # Per-year match slices, so callbacks do a dict lookup instead of
+    # scanning the whole matches table on every click.
+    matches_by_year = {year: group for year, group in matches_df.groupby("Year", sort=False)}
+    teams_by_year = {
+        year: np.unique(np.concatenate([group["Home Team Name"].dropna().to_numpy(), group["Away Team Name"].dropna().to_numpy()])).tolist()
+        for year, group in matches_by_year.items()
+    }
+    # Team dropdown options per tournament, built once from the team lists.
+    team_options_by_year = {
+        year: [{"label": team, "value": team} for team in teams]
+        for year, teams in teams_by_year.items()
+    }
+
+    # Overview rows indexed by Year (column kept) for direct .at lookups.
+    overview_by_year = world_cup_overview_df.set_index("Year", drop=False)
+
+    # Row positions of every (year, team) pair's matches, counting both the
+    # home and away side, so the team journey is a positional take.
+    match_positions = np.arange(len(matches_df))
+    team_match_long = pd.DataFrame({
+        "Year": np.concatenate([matches_df["Year"].to_numpy(), matches_df["Year"].to_numpy()]),
+        "Team": np.concatenate([matches_df["Home Team Name"].to_numpy(), matches_df["Away Team Name"].to_numpy()]),
+        "Position": np.concatenate([match_positions, match_positions]),
+    })
+    match_rows_by_year_team = {
+        key: np.sort(group.to_numpy())
+        for key, group in team_match_long.groupby(["Year", "Team"], sort=False)["Position"]
+    }
+    no_match_rows = np.array([], dtype=np.intp)
+
+    # Team name -> FIFA initials (each name maps to a single code in the data).
+    team_to_initials = dict(zip(matches_df["Home Team Name"].to_numpy(), matches_df["Home Team Initials"].to_numpy()))
+    team_to_initials.update(zip(matches_df["Away Team Name"].to_numpy(), matches_df["Away Team Initials"].to_numpy()))
+
+    # Row positions of each tournament's player events, so a click does a
+    # positional take instead of an isin() over the whole players table.
+    match_year_by_id = pd.Series(matches_df["Year"].to_numpy(), index=matches_df["MatchID"])
+    player_rows_by_year = players_df.groupby(players_df["MatchID"].map(match_year_by_id), sort=False).indices
+
+    # Golden Boot table for every tournament, so a click never regroups goals.
+    def build_tournament_boot_table(year):
+        tournament_players = players_df.iloc[player_rows_by_year.get(year, [])]
+        goals = tournament_players[tournament_players['is_goal']]
+        top_scorers = goals[['Player Name', 'Team Initials']].value_counts().reset_index(name='Goals').sort_values(by=['Goals', 'Player Name'], ascending=[False, True]).head(10)
+        return create_leaderboard_table(top_scorers, 'Goals')
+    tournament_boot_tables = {year: build_tournament_boot_table(year) for year in world_cup_overview_df["Year"].tolist()}
+
+    # Row positions of each team's events in each match, so a team's squad in
+    # a tournament is a concatenation of a few lookups rather than an isin().
+    player_rows_by_match_team = players_df.groupby(["MatchID", "Team Initials"], observed=True, sort=False).indices
+
+    # Flag images for the match journey table, built once per team.
+    match_flag_imgs = {
+        team: html.Img(src=flag_url, style=MATCH_FLAG_STYLE)
+        for team, flag_url in zip(all_teams, flag_urls_for(pd.Series(all_teams, dtype=object)))
+    }
+    # The info lines and team header still look flags up one name at a time,
+    # so warm get_flag_url's cache for every team they can show.
+    for team in all_teams:
+        get_flag_url(team)
+
+    # One highlighted map per tournament; a click then becomes a dict lookup.
+    tournament_map_figs = {
+        year: create_map_figure(
+            all_teams_list=all_teams,
+            iso_map=country_iso_map,
+            teams_to_highlight=teams_by_year.get(year, []),
+            winner=winner,
+            runner_up=runner_up,
+            third_place=third
+        ).to_dict()
+        for year, winner, runner_up, third in world_cup_overview_df[["Year", "Winner", "Runners-Up", "Third"]].itertuples(index=False, name=None)
+    }
+
+    # All-time head-to-head totals for every pair that has met, keyed by the
+    # alphabetically sorted pair: [matches, first wins, second wins, draws,
+    # first goals, second goals]. Each match is oriented to its sorted pair
+    # with array ops, then one groupby sums every tally at once.
+    h2h_source = matches_df.dropna(subset=["Home Team Name", "Away Team Name"])
+    home_names = h2h_source["Home Team Name"].to_numpy(dtype=object)
+    away_names = h2h_source["Away Team Name"].to_numpy(dtype=object)
+    home_goals = h2h_source["Home Team Goals"].to_numpy(dtype=np.int64)
+    away_goals = h2h_source["Away Team Goals"].to_numpy(dtype=np.int64)
+    swap = home_names > away_names
+    first_goals = np.where(swap, away_goals, home_goals)
+    second_goals = np.where(swap, home_goals, away_goals)
+    h2h_totals = pd.DataFrame({
+        "first": np.where(swap, away_names, home_names),
+        "second": np.where(swap, home_names, away_names),
+        "matches": 1,
+        "first_wins": first_goals > second_goals,
+        "second_wins": second_goals > first_goals,
+        "draws": first_goals == second_goals,
+        "first_goals": first_goals,
+        "second_goals": second_goals,
+    }).groupby(["first", "second"], sort=False).sum()
+    h2h_stats = dict(zip(h2h_totals.index, h2h_totals.to_numpy().tolist()))
+
+    # Every pair that has met is a key of h2h_stats, so each team's
+    # historical opponents (and their dropdown options) follow directly.
+    opponents_of = {}
+    for first, second in h2h_stats:
+        opponents_of.setdefault(first, []).append(second)
+        opponents_of.setdefault(second, []).append(first)
+    opponent_options_by_team = {
+        team: [{'label': opponent, 'value': opponent} for opponent in sorted(opponents)]
+        for team, opponents in opponents_of.items()
+    }
+
+    # --- OVERVIEW SCATTER TEMPLATE ---
+    # Nothing about the figure's data or layout depends on the slider, so the
+    # legend entries, layout and single data trace are built once here. The
+    # callback sends the full figure on first render and only Patches of the
+    # per-point highlight styles after that.
+    # Attendance is stored as text like "1.045.246"; parse it once for marker sizes.
+    # (The tournament summary still shows the original text.)
+    continent_color_map = {
+        'Europe': '#1f77b4', 'South America': '#ff7f0e',
+        'North America': '#2ca02c', 'Asia': '#d62728', 'Africa': '#9467bd'
+    }
+
+    attendance_digits = str.maketrans('', '', '.')
+    overview_df = world_cup_overview_df.assign(Attendance=pd.to_numeric(
+        pd.Series([a.translate(attendance_digits) if isinstance(a, str) else a for a in world_cup_overview_df['Attendance']], index=world_cup_overview_df.index),
+        errors='coerce'
+    ))
+    # Marker size/color per tournament never change, so the callback only slices them.
+    overview_df = overview_df.assign(
+        MarkerSize=overview_df['Attendance'] / 80000,
+        MarkerColor=overview_df['Continent'].map(continent_color_map),
+    )
+    overview_df = overview_df.sort_values("Year", kind="stable")
+    overview_years = overview_df["Year"].to_numpy()
+
+    # --- LEGEND GENERATION  ---
+    # A tiny, invisible scatter plot point for each continent.
+    # This is ONLY to create the correct legend items.
+    overview_legend_traces = [
+        go.Scatter(
+            x=[None], y=[None], # No data
+            mode='markers',
+            marker=dict(color=color, size=10),
+            name=continent, # This sets the legend text
+            showlegend=True
+        )
+        for continent, color in continent_color_map.items()
+    ]
+
+    # --- Layout and Styling ---
+    overview_layout = go.Layout(
+        title={'text': "<b>World Cup Tournaments Overview (1930-2014)</b>", 'y':0.95, 'x':0.5, 'xanchor': 'center', 'yanchor': 'top'},
+        xaxis_title="Tournament Year",
+        yaxis_title="Total Goals Scored",
+        legend_title_text="<b>Host Continent</b>", # Make title bold
+        showlegend=True, # Ensure the overall legend is visible
+        margin=dict(l=40, r=40, t=60, b=40),
+        transition_duration=300,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+
+    # Position of the data trace after the legend entries.
+    overview_data_trace = len(overview_legend_traces)
+
+    # Every tournament is always plotted; the slider only changes how each
+    # point is styled, so positions, sizes, colours and hover data are fixed.
+    overview_points = {
+        'x': overview_df['Year'].to_numpy(),
+        'y': overview_df['GoalsScored'].to_numpy(),
+        'size': overview_df['MarkerSize'].to_numpy(),
+        'color': overview_df['MarkerColor'].to_numpy(),
+        'customdata': np.column_stack([overview_df[col].to_numpy(dtype=object) for col in ['Year', 'Country', 'Winner', 'Attendance', 'Continent']]),
+    }
+
+    @lru_cache(maxsize=64)
+    def overview_selection(low, high):
+        """Per-point highlight styles and summary text for one slider range (cached)."""
+        # Years are sorted, so the range is one contiguous block of rows.
+        start = np.searchsorted(overview_years, low, side='left')
+        stop = np.searchsorted(overview_years, high, side='right')
+        in_range = np.zeros(len(overview_df), dtype=bool)
+        in_range[start:stop] = True
+        selected_df = overview_df.iloc[start:stop]
+        summary_text = f"Highlighting {len(selected_df)} tournaments from {low} to {high}, with a total of {selected_df['GoalsScored'].sum():,} goals scored."
+        styles = {
+            'opacity': np.where(in_range, 1.0, 0.3),
+            'line_width': np.where(in_range, 1.5, 1.0),
+            'line_color': np.where(in_range, 'Black', 'DarkSlateGrey'),
+        }
+        return styles, summary_text
+
+    # --- CALLBACK 1: full figure on first render, then highlight Patches ---
     @app.callback(
         Output("world-cup-overview-scatter", "figure"),
         Output("range-summary-output", "children"),
         Input("year-range-slider", "value")
     )
     def update_overview_scatter(year_range):
-        df = world_cup_overview_df.copy()
-        
-        filtered_df = df[(df['Year'] >= year_range[0]) & (df['Year'] <= year_range[1])]
-        summary_text = f"Highlighting {len(filtered_df)} tournaments from {year_range[0]} to {year_range[1]}, with a total of {filtered_df['GoalsScored'].sum():,} goals scored."
-        df['Attendance'] = pd.to_numeric(df['Attendance'].str.replace('.', '', regex=False), errors='coerce')
-        
-        selected_df = df[(df['Year'] >= year_range[0]) & (df['Year'] <= year_range[1])]
-        unselected_df = df[~((df['Year'] >= year_range[0]) & (df['Year'] <= year_range[1]))]
-
-        continent_color_map = {
-            'Europe': '#1f77b4', 'South America': '#ff7f0e',
-            'North America': '#2ca02c', 'Asia': '#d62728', 'Africa': '#9467bd'
-        }
+        styles, summary_text = overview_selection(year_range[0], year_range[1])
+
+        # After the first render only the highlight styles change, so send a
+        # Patch for those marker arrays instead of the whole figure.
+        if callback_context.triggered:
+            fig = Patch()
+            fig['data'][overview_data_trace]['marker']['opacity'] = styles['opacity']
+            fig['data'][overview_data_trace]['marker']['line']['width'] = styles['line_width']
+            fig['data'][overview_data_trace]['marker']['line']['color'] = styles['line_color']
+            return fig, summary_text
+
+        # --- DATA TRACE (WebGL, legend disabled) ---
+        # One trace for all tournaments, highlighted per point.
+        data_trace = go.Scattergl(
+            x=overview_points['x'], y=overview_points['y'], mode='markers',
+            marker=dict(size=overview_points['size'], color=overview_points['color'], opacity=styles['opacity'], line={'width': styles['line_width'], 'color': styles['line_color']}),
+            customdata=overview_points['customdata'],
+            hovertemplate=OVERVIEW_HOVERTEMPLATE,
+            showlegend=False # Disable legend for the data trace
+        )
 
-        fig = go.Figure()
+        # Static legend entries + layout, plus the data trace, in one construction
+        fig = go.Figure(data=[*overview_legend_traces, data_trace], layout=overview_layout)
+        
+        return fig, summary_text
 
-        # --- LEGEND GENERATION  ---
-        # Add a tiny, invisible scatter plot point for each continent.
-        # This is ONLY to create the correct legend items.
-        for continent, color in continent_color_map.items():
-            fig.add_trace(go.Scatter(
-                x=[None], y=[None], # No data
-                mode='markers',
-                marker=dict(color=color, size=10),
-                name=continent, # This sets the legend text
-                showlegend=True
-            ))
-
-        # --- DATA TRACES (with legend disabled) ---
-        if not unselected_df.empty:
-            fig.add_trace(go.Scatter(
-                x=unselected_df['Year'], y=unselected_df['GoalsScored'], mode='markers',
-                marker=dict(size=unselected_df['Attendance'] / 80000, color=unselected_df['Continent'].map(continent_color_map), opacity=0.3, line={'width': 1, 'color': 'DarkSlateGrey'}),
-                customdata=unselected_df[['Year', 'Country', 'Winner', 'Attendance', 'Continent']],
-                hovertemplate="<b>%{customdata[1]} %{x}</b><br>Winner: %{customdata[2]}<br>Continent: %{customdata[4]}<br>Goals: %{y}<br>Attendance: %{customdata[3]:,}<extra></extra>",
-                showlegend=False # Disable legend for the data traces
-            ))
-
-        if not selected_df.empty:
-            fig.add_trace(go.Scatter(
-                x=selected_df['Year'], y=selected_df['GoalsScored'], mode='markers',
-                marker=dict(size=selected_df['Attendance'] / 80000, color=selected_df['Continent'].map(continent_color_map), opacity=1.0, line={'width': 1.5, 'color': 'Black'}),
-                customdata=selected_df[['Year', 'Country', 'Winner', 'Attendance', 'Continent']],
-                hovertemplate="<b>%{customdata[1]} %{x}</b><br>Winner: %{customdata[2]}<br>Continent: %{customdata[4]}<br>Goals: %{y}<br>Attendance: %{customdata[3]:,}<extra></extra>",
-                showlegend=False # Disable legend for the data traces
-            ))
+    @lru_cache(maxsize=32)
+    def build_tournament_details(year):
+        """Summary panel, Golden Boot table and team options for one tournament (cached per year)."""
+        def create_info_line(label, country_name):
+            flag_url = get_flag_url(country_name)
+            return html.P([html.Strong(f"{label}: "), html.Img(src=flag_url, style={"height": "16px", "marginRight": "5px", "verticalAlign": "middle"}), country_name], style={"marginBottom": "5px"})
+        summary_children = html.Div([
+            html.H4(f"World Cup {overview_by_year.at[year, 'Year']} in {overview_by_year.at[year, 'Country']}", style={"color": "#1a5276"}),
+            create_info_line("Winner", overview_by_year.at[year, "Winner"]),
+            create_info_line("Runner-Up", overview_by_year.at[year, "Runners-Up"]),
+            create_info_line("Third Place", overview_by_year.at[year, "Third"]),
+            html.Strong("Stats:", style={"marginTop": "10px", "display": "block"}),
+            html.P(f"Goals Scored: {overview_by_year.at[year, 'GoalsScored']}"),
+            html.P(f"Matches Played: {overview_by_year.at[year, 'MatchesPlayed']}"),
+            html.P(f"Attendance: {overview_by_year.at[year, 'Attendance']}"),
+        ])
         
-        # --- Layout and Styling ---
-        fig.update_layout(
-            title={'text': "<b>World Cup Tournaments Overview (1930-2014)</b>", 'y':0.95, 'x':0.5, 'xanchor': 'center', 'yanchor': 'top'},
-            xaxis_title="Tournament Year",
-            yaxis_title="Total Goals Scored",
-            legend_title_text="<b>Host Continent</b>", # Make title bold
-            showlegend=True, # Ensure the overall legend is visible
-            margin=dict(l=40, r=40, t=60, b=40),
-            transition_duration=300,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)'
-        )
+        tournament_boot_table = tournament_boot_tables[year]
         
-        return fig, summary_text
+        team_options = team_options_by_year.get(year, [])
+
+        return summary_children, tournament_boot_table, team_options
 
     @app.callback(
         Output("world-map-choropleth", "figure"),
@@ -180,56 +424,68 @@ def register_callbacks(
         triggered_id = ctx.triggered[0]['prop_id'].split('.')[0]
 
         if triggered_id == "clear-selection-button" or clickData is None:
-            map_fig = create_map_figure(all_teams, country_iso_map)
-            
-            all_goals = players_df[players_df['Event'].str.contains('G|P', na=False)]
-            all_top_scorers = all_goals.groupby(['Player Name', 'Team Initials'])['Event'].count().reset_index().rename(columns={'Event': 'Goals'}).sort_values(by='Goals', ascending=False).head(10)
-            all_time_boot_table = create_leaderboard_table(all_top_scorers, 'Goals')
-        
-
-            initial_summary = html.P("Click on a tournament to see details.", style={"color":"#7f8c8d"})
-            return map_fig, initial_summary, all_time_boot_table, [], None, True, {'display': 'none'}
+            return default_map_fig, INITIAL_TOURNAMENT_SUMMARY, all_time_boot_table, [], None, True, CLEAR_BUTTON_HIDDEN_STYLE
 
         # --- TOURNAMENT SELECTED STATE ---
         clicked_year = clickData["points"][0]["customdata"][0]
+        map_fig = tournament_map_figs[clicked_year]
+        summary_children, tournament_boot_table, team_options = build_tournament_details(clicked_year)
+
+        return map_fig, summary_children, tournament_boot_table, team_options, None, False, CLEAR_BUTTON_VISIBLE_STYLE
+
+    # Room for every (year, team) selection the dropdowns can offer, so the
+    # per-team views are never evicted however many a user browses.
+    team_details_cache_size = max(512, sum(len(teams) for teams in teams_by_year.values()))
+
+    @lru_cache(maxsize=team_details_cache_size)
+    def build_team_details(selected_year, selected_team):
+        """Journey/player tables and historical opponent options for one team in one tournament (cached)."""
+        # --- Team Journey & Player Stats (from the precomputed row lookups) ---
+        team_matches = matches_df.iloc[match_rows_by_year_team.get((selected_year, selected_team), no_match_rows)]
         
-        year_matches = matches_df[matches_df["Year"] == clicked_year]
-        tournament_teams = sorted(list(set(year_matches["Home Team Name"].unique()) | set(year_matches["Away Team Name"].unique())))
-        tournament_info = world_cup_overview_df[world_cup_overview_df["Year"] == clicked_year].iloc[0]
+        # Classify every match from the selected team's side in one vectorized pass
+        home_goals = team_matches["Home Team Goals"].to_numpy(np.int32)
+        away_goals = team_matches["Away Team Goals"].to_numpy(np.int32)
+        is_home = team_matches["Home Team Name"].to_numpy() == selected_team
+        team_goals = np.where(is_home, home_goals, away_goals)
+        opponent_goals = np.where(is_home, away_goals, home_goals)
+        result_codes = np.sign(team_goals - opponent_goals) + 1
+        results = MATCH_RESULT_LABELS[result_codes].tolist()
+        result_colors = MATCH_RESULT_COLORS[result_codes].tolist()
+        opponents = np.where(is_home, team_matches["Away Team Name"].to_numpy(), team_matches["Home Team Name"].to_numpy())
+        scores = [f"{team} - {opp}" for team, opp in zip(team_goals.tolist(), opponent_goals.tolist())]
+
+        match_table_rows = [
+            html.Tr([html.Td(stage), html.Td([match_flag_imgs[opponent], opponent]), html.Td(score, style=SCORE_CELL_STYLE), html.Td(html.Span(result, style=RESULT_BADGE_STYLES[color]))])
+            for stage, opponent, score, result, color in zip(team_matches["Stage"].to_numpy(), opponents, scores, results, result_colors)
+        ]
+        match_table_header = html.Thead(html.Tr([html.Th("Stage"), html.Th("Opponent"), html.Th("Score"), html.Th("Result")]))
+        match_journey_table = html.Table([match_table_header, html.Tbody(match_table_rows)], className="table table-sm mt-2")
         
-        map_fig = create_map_figure(
-            all_teams_list=all_teams,
-            iso_map=country_iso_map,
-            teams_to_highlight=tournament_teams,
-            winner=tournament_info['Winner'],
-            runner_up=tournament_info['Runners-Up'],
-            third_place=tournament_info['Third']
+        team_match_ids = team_matches["MatchID"].unique()
+        team_initials = team_to_initials[selected_team]
+        team_player_rows = [player_rows_by_match_team.get((match_id, team_initials), no_match_rows) for match_id in team_match_ids.tolist()]
+        team_players_events = players_df.iloc[np.sort(np.concatenate([no_match_rows, *team_player_rows]))]
+        # One grouped sum over the precomputed event flags gives every player's totals
+        player_totals = team_players_events.groupby("Player Name", observed=True)[["is_goal", "is_yellow", "is_red"]].sum()
+        # ~20 rows: sort plain tuples (most goals first, then by name) rather than a DataFrame
+        player_stats = sorted(
+            zip(player_totals.index.tolist(), *(player_totals[col].tolist() for col in ["is_goal", "is_yellow", "is_red"])),
+            key=lambda record: (-record[1], record[0])
         )
+        player_table_header = html.Thead(html.Tr([html.Th("Player"), html.Th("Goals"), html.Th("Yellow"), html.Th("Red")]))
+        player_table_rows = [html.Tr([html.Td(player), html.Td(goals), html.Td(yellows), html.Td(reds)]) for player, goals, yellows, reds in player_stats]
+        player_table = html.Table([player_table_header, html.Tbody(player_table_rows)], className="table table-sm table-striped mt-3")
         
-        def create_info_line(label, country_name):
-            flag_url = get_flag_url(country_name)
-            return html.P([html.Strong(f"{label}: "), html.Img(src=flag_url, style={"height": "16px", "marginRight": "5px", "verticalAlign": "middle"}), country_name], style={"marginBottom": "5px"})
-        summary_children = html.Div([
-            html.H4(f"World Cup {tournament_info['Year']} in {tournament_info['Country']}", style={"color": "#1a5276"}),
-            create_info_line("Winner", tournament_info["Winner"]),
-            create_info_line("Runner-Up", tournament_info["Runners-Up"]),
-            create_info_line("Third Place", tournament_info["Third"]),
-            html.Strong("Stats:", style={"marginTop": "10px", "display": "block"}),
-            html.P(f"Goals Scored: {tournament_info['GoalsScored']}"),
-            html.P(f"Matches Played: {tournament_info['MatchesPlayed']}"),
-            html.P(f"Attendance: {tournament_info['Attendance']}"),
+        team_player_summary = html.Div([
+            html.H5([html.Img(src=get_flag_url(selected_team), style=TEAM_HEADER_FLAG_STYLE), f"{selected_team}'s Journey in {selected_year}"], style={"color": "#1a5276"}),
+            html.H6("Match Results", style={"marginTop": "15px"}), match_journey_table,
+            html.H6("Player Statistics", style={"marginTop": "20px"}), player_table,
         ])
-        
-        year_matches_ids = matches_df[matches_df['Year'] == clicked_year]['MatchID'].unique()
-        tournament_players = players_df[players_df['MatchID'].isin(year_matches_ids)]
-        goals = tournament_players[tournament_players['Event'].str.contains('G|P', na=False)]
-        top_scorers = goals.groupby(['Player Name', 'Team Initials'])['Event'].count().reset_index().rename(columns={'Event': 'Goals'}).sort_values(by=['Goals', 'Player Name'], ascending=[False, True]).head(10)
-        tournament_boot_table = create_leaderboard_table(top_scorers, 'Goals')
-        
-        # CORRECT: Use the unique 'tournament_teams' variable to populate the dropdown
-        team_options = [{"label": team, "value": team} for team in tournament_teams]
 
-        return map_fig, summary_children, tournament_boot_table, team_options, None, False, {'float': 'right', 'display': 'block', 'marginBottom': '10px'}
+        opponent_options = opponent_options_by_team.get(selected_team, [])
+
+        return team_player_summary, opponent_options
 
     # --- REWORKED CALLBACK 3: Handles team selection to update journey and H2H ---
     @app.callback(
@@ -247,94 +503,34 @@ def register_callbacks(
         prevent_initial_call=True
     )
     def update_team_details(selected_team, clickData):
-        initial_summary = html.P("Select a team to see their performance.", style={"color":"#7f8c8d"})
-        
         # When no team is selected, hide the H2H panel
         if selected_team is None or clickData is None:
             # MODIFIED: Return style for the parent panel
-            return initial_summary, [], None, True, {'display': 'none'}
+            return INITIAL_TEAM_SUMMARY, [], None, True, H2H_PANEL_HIDDEN_STYLE
 
         selected_year = clickData["points"][0]["customdata"][0]
-        
-        # --- Team Journey & Player Stats (This logic is unchanged) ---
-        team_matches = matches_df[(matches_df["Year"] == selected_year) & ((matches_df["Home Team Name"] == selected_team) | (matches_df["Away Team Name"] == selected_team))]
-        
-        match_table_rows = []
-        for _, match in team_matches.iterrows():
-            is_home_team = match["Home Team Name"] == selected_team
-            opponent = match["Away Team Name"] if is_home_team else match["Home Team Name"]
-            score = f"{int(match['Home Team Goals'])} - {int(match['Away Team Goals'])}" if is_home_team else f"{int(match['Away Team Goals'])} - {int(match['Home Team Goals'])}"
-            if match["Home Team Goals"] == match["Away Team Goals"]: result, color = "D", "#6c757d"
-            elif (is_home_team and match["Home Team Goals"] > match["Away Team Goals"]) or (not is_home_team and match["Away Team Goals"] > match["Home Team Goals"]): result, color = "W", "#28a745"
-            else: result, color = "L", "#dc3545"
-            match_table_rows.append(html.Tr([html.Td(match["Stage"]),html.Td([html.Img(src=get_flag_url(opponent), style={"height": "16px", "marginRight": "8px"}), opponent]),html.Td(score, style={"fontWeight": "bold", "textAlign": "center"}),html.Td(html.Span(result, style={"backgroundColor": color, "color": "white", "padding": "3px 10px", "borderRadius": "6px", "fontWeight": "bold", "fontSize": "12px"}))]))
-        match_table_header = html.Thead(html.Tr([html.Th("Stage"), html.Th("Opponent"), html.Th("Score"), html.Th("Result")]))
-        match_journey_table = html.Table([match_table_header, html.Tbody(match_table_rows)], className="table table-sm mt-2")
-        
-        team_match_ids = team_matches["MatchID"].unique()
-        team_initials = team_matches[team_matches['Home Team Name'] == selected_team]['Home Team Initials'].iloc[0] if selected_team in team_matches['Home Team Name'].values else team_matches[team_matches['Away Team Name'] == selected_team]['Away Team Initials'].iloc[0]
-        team_players_events = players_df[(players_df["MatchID"].isin(team_match_ids)) & (players_df["Team Initials"] == team_initials)]
-        player_roster = sorted(team_players_events["Player Name"].unique())
-        player_stats = []
-        for player in player_roster:
-            player_events = team_players_events[team_players_events["Player Name"] == player]
-            player_stats.append({"Player": player,"Goals": player_events["Event"].str.contains("G|P", na=False).sum(),"Yellow Cards": player_events["Event"].str.contains("Y", na=False).sum(),"Red Cards": player_events["Event"].str.contains("R", na=False).sum()})
-        stats_df = pd.DataFrame(player_stats).sort_values(by=["Goals", "Player"], ascending=[False, True])
-        player_table_header = html.Thead(html.Tr([html.Th("Player"), html.Th("Goals"), html.Th("Yellow"), html.Th("Red")]))
-        player_table_rows = [html.Tr([html.Td(row["Player"]), html.Td(row["Goals"]), html.Td(row["Yellow Cards"]), html.Td(row["Red Cards"])]) for i, row in stats_df.iterrows()]
-        player_table = html.Table([player_table_header, html.Tbody(player_table_rows)], className="table table-sm table-striped mt-3")
-        
-        team_player_summary = html.Div([
-            html.H5([html.Img(src=get_flag_url(selected_team), style={"height": "24px", "marginRight": "8px", "verticalAlign": "middle"}), f"{selected_team}'s Journey in {selected_year}"], style={"color": "#1a5276"}),
-            html.H6("Match Results", style={"marginTop": "15px"}), match_journey_table,
-            html.H6("Player Statistics", style={"marginTop": "20px"}), player_table,
-        ])
-
-        all_time_matches = matches_df[
-            (matches_df['Home Team Name'] == selected_team) | 
-            (matches_df['Away Team Name'] == selected_team)
-        ]
-
-        # 2. Get the opponent from each of those matches.
-        home_opponents = all_time_matches[all_time_matches['Home Team Name'] == selected_team]['Away Team Name']
-        away_opponents = all_time_matches[all_time_matches['Away Team Name'] == selected_team]['Home Team Name']
-
-        # 3. Combine them, find the unique values, and sort them.
-        historical_opponents = sorted(pd.concat([home_opponents, away_opponents]).unique())
-        
-        # 4. Create the dropdown options from this filtered list.
-        opponent_options = [{'label': team, 'value': team} for team in historical_opponents]
+        team_player_summary, opponent_options = build_team_details(selected_year, selected_team)
 
         # MODIFIED: When a team is selected, show the H2H panel
-        card_style = {"border": "1px solid #d5dbdb", "padding": "20px", "borderRadius": "8px", "backgroundColor": "#ffffff", "boxShadow": "0 4px 8px rgba(0,0,0,0.05)", "marginBottom": "20px"}
-        return team_player_summary, opponent_options, None, False, {'display': 'block', **card_style}
+        return team_player_summary, opponent_options, None, False, H2H_PANEL_VISIBLE_STYLE
 
-    # --- REWORKED CALLBACK 4: H2H Analysis (mostly the same, just cleaner) ---
-    @app.callback(
-        Output("h2h-analysis-output", "children"),
-        Input("opponent-selector-dropdown", "value"),
-        State("team-selector-dropdown", "value"),
-        prevent_initial_call=True
-    )
-    def update_h2h_analysis(opponent, team1):
-        if not opponent or not team1:
-            return None
-
-        h2h_matches = matches_df[((matches_df['Home Team Name'] == team1) & (matches_df['Away Team Name'] == opponent)) | ((matches_df['Home Team Name'] == opponent) & (matches_df['Away Team Name'] == team1))]
+    @lru_cache(maxsize=128)
+    def build_h2h_analysis(team1, opponent):
+        """All-time head-to-head summary and mirrored bar chart for a pair of teams (cached)."""
+        first, second = sorted((team1, opponent))
+        stats = h2h_stats.get((first, second))
 
-        if h2h_matches.empty:
+        if stats is None:
             return html.P("No all-time World Cup matches found between these two teams.")
 
-        # --- 1. Calculate All Metrics ---
-        team1_wins = ((h2h_matches['Home Team Name'] == team1) & (h2h_matches['Home Team Goals'] > h2h_matches['Away Team Goals'])).sum() + \
-                     ((h2h_matches['Away Team Name'] == team1) & (h2h_matches['Away Team Goals'] > h2h_matches['Home Team Goals'])).sum()
-        draws = (h2h_matches['Home Team Goals'] == h2h_matches['Away Team Goals']).sum()
-        opponent_wins = len(h2h_matches) - team1_wins - draws
-        
-        team1_goals = h2h_matches.loc[h2h_matches['Home Team Name'] == team1, 'Home Team Goals'].sum() + h2h_matches.loc[h2h_matches['Away Team Name'] == team1, 'Away Team Goals'].sum()
-        opponent_goals = h2h_matches.loc[h2h_matches['Home Team Name'] == opponent, 'Home Team Goals'].sum() + h2h_matches.loc[h2h_matches['Away Team Name'] == opponent, 'Away Team Goals'].sum()
+        # --- 1. Look up All Metrics, oriented from team1's side ---
+        match_count, first_wins, second_wins, draws, first_goals, second_goals = stats
+        if team1 == first:
+            team1_wins, opponent_wins, team1_goals, opponent_goals = first_wins, second_wins, first_goals, second_goals
+        else:
+            team1_wins, opponent_wins, team1_goals, opponent_goals = second_wins, first_wins, second_goals, first_goals
 
-        summary_text = f"Matches Played: {len(h2h_matches)}"
+        summary_text = f"Matches Played: {match_count}"
         
         # --- 2. Create the Mirrored Bar Chart Figure ---
         fig = go.Figure()
@@ -392,6 +588,19 @@ def register_callbacks(
             html.P(summary_text),
             dcc.Graph(figure=fig, style={'flex': 1})
         ])
+
+    # --- REWORKED CALLBACK 4: H2H Analysis (mostly the same, just cleaner) ---
+    @app.callback(
+        Output("h2h-analysis-output", "children"),
+        Input("opponent-selector-dropdown", "value"),
+        State("team-selector-dropdown", "value"),
+        prevent_initial_call=True
+    )
+    def update_h2h_analysis(opponent, team1):
+        if not opponent or not team1:
+            return None
+
+        return build_h2h_analysis(team1, opponent)
     
     
     @app.callback(
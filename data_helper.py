@@ -1,5 +1,9 @@
 import pandas as pd
 import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
 
 # --- NEW FLAG SYSTEM (PRESERVED) ---
 # This new, more robust flag system is kept exactly as you designed it.
@@ -29,49 +33,94 @@ MANUAL_NAME_TO_ISO2 = {
     "Tunisia": "tn", "Turkey": "tr", "Ukraine": "ua", "United Arab Emirates": "ae", "Uruguay": "uy",
 }
 
+# Lookup keyed by stripped, casefolded names with lower-case codes, built once
+# so each call is a single probe that tolerates case/whitespace differences.
+ISO2_BY_CASEFOLDED_NAME = {name.strip().casefold(): iso2.lower() for name, iso2 in MANUAL_NAME_TO_ISO2.items()}
+
+@lru_cache(maxsize=512)
 def country_to_iso2(name: str) -> str | None:
     if not name or not isinstance(name, str): return None
-    iso_code = MANUAL_NAME_TO_ISO2.get(name.strip())
-    return iso_code.lower() if iso_code else None
+    return ISO2_BY_CASEFOLDED_NAME.get(name.strip().casefold())
 
 def get_flag_url_by_iso(iso2: str) -> str:
     if not iso2: return ""
     return f"https://flagcdn.com/w320/{iso2}.png"
 
+@lru_cache(maxsize=512)
 def get_flag_url(country_name: str) -> str:
     iso2 = country_to_iso2(country_name)
     return get_flag_url_by_iso(iso2) if iso2 else ""
 
+def flag_urls_for(names: pd.Series) -> pd.Series:
+    """Vectorized get_flag_url: flag URLs for a Series of country names ('' when unknown)."""
+    iso2 = names.str.strip().str.casefold().map(ISO2_BY_CASEFOLDED_NAME)
+    return ("https://flagcdn.com/w320/" + iso2 + ".png").fillna("")
+
 # --- MAP HELPER (PRESERVED) ---
+# This is correct. It's the ONLY place where different Germany names
+# should be consolidated for the map visualization.
+COUNTRY_ISO_MAP = {
+    'USA': 'USA', 'Uruguay': 'URY', 'Argentina': 'ARG', 'Yugoslavia': 'YUG', 'Chile': 'CHL',
+    'Brazil': 'BRA', 'France': 'FRA', 'Romania': 'ROU', 'Paraguay': 'PRY', 'Peru': 'PER',
+    'Belgium': 'BEL', 'Bolivia': 'BOL', 'Mexico': 'MEX', 'Italy': 'ITA', 'Czechoslovakia': 'CZE',
+    'Germany': 'DEU', 'West Germany': 'DEU', 'Germany FR': 'DEU', 'Austria': 'AUT', 'Spain': 'ESP',
+    'Hungary': 'HUN', 'Switzerland': 'CHE', 'Sweden': 'SWE', 'Netherlands': 'NLD', 'Egypt': 'EGY',
+    'Cuba': 'CUB', 'Norway': 'NOR', 'Poland': 'POL', 'Dutch East Indies': 'IDN', 'England': 'GBR',
+    'Scotland': 'GBR', 'Wales': 'GBR', 'Northern Ireland': 'GBR', 'Turkey': 'TUR',
+    'South Korea': 'KOR', 'Korea Republic': 'KOR', 'Soviet Union': 'RUS', 'Colombia': 'COL',
+    'Bulgaria': 'BGR', 'North Korea': 'PRK', 'Portugal': 'PRT', 'Morocco': 'MAR',
+    'El Salvador': 'SLV', 'Israel': 'ISR', 'East Germany': 'DEU', 'Australia': 'AUS',
+    'Haiti': 'HTI', 'Zaire': 'COD', 'Tunisia': 'TUN', 'IR Iran': 'IRN', 'Iran': 'IRN',
+    'Algeria': 'DZA', 'Cameroon': 'CMR', 'Honduras': 'HND', 'Kuwait': 'KWT',
+    'New Zealand': 'NZL', 'Denmark': 'DNK', 'Iraq': 'IRQ', 'Canada': 'CAN',
+    'Republic of Ireland': 'IRL', 'Costa Rica': 'CRI', 'United Arab Emirates': 'ARE',
+    'Nigeria': 'NGA', 'Saudi Arabia': 'SAU', 'Russia': 'RUS', 'Greece': 'GRC',
+    'Croatia': 'HRV', 'Jamaica': 'JAM', 'South Africa': 'ZAF', 'Japan': 'JPN',
+    'FR Yugoslavia': 'YUG', 'Senegal': 'SEN', 'Slovenia': 'SVN', 'Ecuador': 'ECU',
+    'China PR': 'CHN', 'Trinidad and Tobago': 'TTO', 'Ivory Coast': 'CIV', "Cote d'Ivoire": 'CIV',
+    'Angola': 'AGO', 'Czech Republic': 'CZE', 'Ghana': 'GHA', 'Togo': 'TGO',
+    'Ukraine': 'UKR', 'Serbia and Montenegro': 'SRB', 'Serbia': 'SRB', 'Slovakia': 'SVK',
+    'Bosnia and Herzegovina': 'BIH', 'Iceland': 'ISL', 'Panama': 'PAN', 'Qatar': 'QAT'
+}
+
 def get_country_iso_mapping():
-    # This is correct. It's the ONLY place where different Germany names
-    # should be consolidated for the map visualization.
-    return {
-        'USA': 'USA', 'Uruguay': 'URY', 'Argentina': 'ARG', 'Yugoslavia': 'YUG', 'Chile': 'CHL',
-        'Brazil': 'BRA', 'France': 'FRA', 'Romania': 'ROU', 'Paraguay': 'PRY', 'Peru': 'PER',
-        'Belgium': 'BEL', 'Bolivia': 'BOL', 'Mexico': 'MEX', 'Italy': 'ITA', 'Czechoslovakia': 'CZE',
-        'Germany': 'DEU', 'West Germany': 'DEU', 'Germany FR': 'DEU', 'Austria': 'AUT', 'Spain': 'ESP',
-        'Hungary': 'HUN', 'Switzerland': 'CHE', 'Sweden': 'SWE', 'Netherlands': 'NLD', 'Egypt': 'EGY',
-        'Cuba': 'CUB', 'Norway': 'NOR', 'Poland': 'POL', 'Dutch East Indies': 'IDN', 'England': 'GBR',
-        'Scotland': 'GBR', 'Wales': 'GBR', 'Northern Ireland': 'GBR', 'Turkey': 'TUR',
-        'South Korea': 'KOR', 'Korea Republic': 'KOR', 'Soviet Union': 'RUS', 'Colombia': 'COL',
-        'Bulgaria': 'BGR', 'North Korea': 'PRK', 'Portugal': 'PRT', 'Morocco': 'MAR',
-        'El Salvador': 'SLV', 'Israel': 'ISR', 'East Germany': 'DEU', 'Australia': 'AUS',
-        'Haiti': 'HTI', 'Zaire': 'COD', 'Tunisia': 'TUN', 'IR Iran': 'IRN', 'Iran': 'IRN',
-        'Algeria': 'DZA', 'Cameroon': 'CMR', 'Honduras': 'HND', 'Kuwait': 'KWT',
-        'New Zealand': 'NZL', 'Denmark': 'DNK', 'Iraq': 'IRQ', 'Canada': 'CAN',
-        'Republic of Ireland': 'IRL', 'Costa Rica': 'CRI', 'United Arab Emirates': 'ARE',
-        'Nigeria': 'NGA', 'Saudi Arabia': 'SAU', 'Russia': 'RUS', 'Greece': 'GRC',
-        'Croatia': 'HRV', 'Jamaica': 'JAM', 'South Africa': 'ZAF', 'Japan': 'JPN',
-        'FR Yugoslavia': 'YUG', 'Senegal': 'SEN', 'Slovenia': 'SVN', 'Ecuador': 'ECU',
-        'China PR': 'CHN', 'Trinidad and Tobago': 'TTO', 'Ivory Coast': 'CIV', "Cote d'Ivoire": 'CIV',
-        'Angola': 'AGO', 'Czech Republic': 'CZE', 'Ghana': 'GHA', 'Togo': 'TGO',
-        'Ukraine': 'UKR', 'Serbia and Montenegro': 'SRB', 'Serbia': 'SRB', 'Slovakia': 'SVK',
-        'Bosnia and Herzegovina': 'BIH', 'Iceland': 'ISL', 'Panama': 'PAN', 'Qatar': 'QAT'
-    }
+    """Returns the shared team name -> ISO3 map (built once at import)."""
+    return COUNTRY_ISO_MAP
 
 # --- REWORKED CLEANING AND LOADING FUNCTIONS ---
 
+UMLAUT_REPLACEMENTS = {
+    'Ã¼': 'ue',  # For ü (e.g., Müller -> Mueller)
+    'Ã¶': 'oe',  # For ö (e.g., Götze -> Goetze)
+    'Ã¤': 'ae',  # For ä
+    'Ã©': 'e',   # For é (e.g., Côte d'Ivoire)
+    # Add any other specific mojibake-to-transliteration pairs here
+    # (keys must start with 'Ã'; clean_data_names relies on it)
+}
+UMLAUT_PATTERN = re.compile("|".join(map(re.escape, UMLAUT_REPLACEMENTS)))
+# Cells with the 'rn">' artifact, umlaut mojibake or surrounding whitespace.
+DIRTY_TEXT_PATTERN = re.compile('rn">|' + UMLAUT_PATTERN.pattern + r'|^\s|\s$')
+
+# Full-cell corrections for encoding errors the umlaut pass cannot fix.
+CORRECTIONS = {
+    'C�te d\'Ivoire': 'Côte d\'Ivoire',
+    'Maracan� - Est�dio Jornalista M�rio Filho': 'Maracanã - Estádio Jornalista Mário Filho',
+    'Est�dio Jornalista M�rio Filho': 'Estádio Jornalista Mário Filho',
+    'Maracan�': 'Maracanã',
+    'Stade V�lodrome': 'Stade Vélodrome',
+    'Nou Camp - Estadio Le�n': 'Nou Camp - Estadio León',
+    'Estadio Jos� Mar�a Minella': 'Estadio José María Minella',
+    'Estadio Ol�mpico Chateau Carreras': 'Estadio Olímpico Chateau Carreras',
+    'Estadio Municipal de Bala�dos': 'Estadio Municipal de Balaídos',
+    'Estadio Ol�mpico Universitario': 'Estadio Olímpico Universitario',
+    'Malm�': 'Malmö',
+    'Malmo': 'Malmö', 
+    'Norrk�Ping': 'Norrköping',
+    'D�Sseldorf': 'Düsseldorf',
+    'La Coru�A': 'A Coruña',
+}
+CORRECTIONS_PATTERN = re.compile('|'.join(re.escape(wrong) for wrong in CORRECTIONS))
+
 def clean_data_names(df):
     """
     Corrects encoding errors, artifacts, and performs transliteration for
@@ -80,101 +129,180 @@ def clean_data_names(df):
     if df is None:
         return df
 
-    # 1. General artifact cleaning (e.g., remove 'rn">')
-    for col in df.select_dtypes(include=['object']).columns:
-        if df[col].dtype == 'object':
-            df[col] = df[col].str.replace(r'rn">', '', regex=True).str.strip()
-
-    # 2. Transliteration for persistent encoding issues (German Umlauts)
-    # This specifically targets the garbled representation of umlauts.
-    umlaut_replacements = {
-        'Ã¼': 'ue',  # For ü (e.g., Müller -> Mueller)
-        'Ã¶': 'oe',  # For ö (e.g., Götze -> Goetze)
-        'Ã¤': 'ae',  # For ä
-        'Ã©': 'e',   # For é (e.g., Côte d'Ivoire)
-        # Add any other specific mojibake-to-transliteration pairs here
-    }
-    for col in df.select_dtypes(include=['object']).columns:
-        if df[col].dtype == 'object':
-            for bad_char, good_char in umlaut_replacements.items():
-                df[col] = df[col].str.replace(bad_char, good_char, regex=False)
+    # 1. General artifact cleaning (e.g., remove 'rn">') and
+    # 2. Transliteration for persistent encoding issues (German Umlauts),
+    # applied only to the cells that need it: most values are already clean,
+    # so each text column is scanned once and untouched cells are skipped.
+    text_columns = df.select_dtypes(include=['object']).columns.tolist()
+    for col in text_columns:
+        needs_cleaning = df[col].str.contains(DIRTY_TEXT_PATTERN, na=False)
+        if not needs_cleaning.any():
+            continue
+        dirty = df.loc[needs_cleaning, col]
+        # The artifact is a literal, so skip the regex engine for it.
+        dirty = dirty.str.replace('rn">', '', regex=False).str.strip()
+        # All mojibake pairs start with 'Ã', so only those cells go through
+        # the regex pass, which applies every pair at once.
+        has_mojibake = dirty.str.contains('Ã', regex=False)
+        if has_mojibake.any():
+            dirty[has_mojibake] = dirty[has_mojibake].str.replace(UMLAUT_PATTERN, lambda match: UMLAUT_REPLACEMENTS[match.group()], regex=True)
+        df.loc[needs_cleaning, col] = dirty
 
     # 3. Specific String Corrections for remaining encoding errors
-    # This handles full-cell replacements.
-    corrections = {
-        'C�te d\'Ivoire': 'Côte d\'Ivoire',
-        'Maracan� - Est�dio Jornalista M�rio Filho': 'Maracanã - Estádio Jornalista Mário Filho',
-        'Est�dio Jornalista M�rio Filho': 'Estádio Jornalista Mário Filho',
-        'Maracan�': 'Maracanã',
-        'Stade V�lodrome': 'Stade Vélodrome',
-        'Nou Camp - Estadio Le�n': 'Nou Camp - Estadio León',
-        'Estadio Jos� Mar�a Minella': 'Estadio José María Minella',
-        'Estadio Ol�mpico Chateau Carreras': 'Estadio Olímpico Chateau Carreras',
-        'Estadio Municipal de Bala�dos': 'Estadio Municipal de Balaídos',
-        'Estadio Ol�mpico Universitario': 'Estadio Olímpico Universitario',
-        'Malm�': 'Malmö',
-        'Malmo': 'Malmö', 
-        'Norrk�Ping': 'Norrköping',
-        'D�Sseldorf': 'Düsseldorf',
-        'La Coru�A': 'A Coruña',
-    }
-    df.replace(corrections, inplace=True)
+    # This handles full-cell replacements, matched in one pass per column.
+    for col in text_columns:
+        fixable = df[col].str.fullmatch(CORRECTIONS_PATTERN, na=False)
+        if fixable.any():
+            df.loc[fixable, col] = df.loc[fixable, col].map(CORRECTIONS)
         
     return df
 
+MATCHES_CATEGORY_COLUMNS = [
+    "Stage", "Stadium", "City", "Home Team Name", "Away Team Name",
+    "Referee", "Assistant 1", "Assistant 2", "Home Team Initials", "Away Team Initials",
+]
+PLAYERS_CATEGORY_COLUMNS = ["Event", "Team Initials", "Coach Name", "Player Name"]
+
+# Numeric dtypes handed to read_csv so the parser allocates compact arrays
+# directly. Years and goal counts are small; compact ints halve the bytes
+# scanned by filters. The matches file has blank rows, hence nullable ints.
+OVERVIEW_DTYPES = {"Year": "int16", "GoalsScored": "int16", "QualifiedTeams": "int8", "MatchesPlayed": "int8"}
+MATCHES_DTYPES = {"Year": "Int16", "Home Team Goals": "Int8", "Away Team Goals": "Int8"}
+KICKOFF_FORMAT = "%d %b %Y - %H:%M"
+KICKOFF_FORMAT_FULL_MONTH = "%d %B %Y - %H:%M"
+
+def prepare_overview(df):
+    """Cleans the tournament overview table's names (dtypes are set at read time)."""
+    # Numeric columns already arrive as compact ints (see OVERVIEW_DTYPES)
+    return clean_data_names(df)
+
+def prepare_matches(df):
+    """De-duplicates and cleans the matches table and sets its compact dtypes."""
+    df.drop_duplicates(subset='MatchID', keep='first', inplace=True)
+    df = clean_data_names(df)
+    # Year/goals arrive as nullable ints (see MATCHES_DTYPES); only the blank
+    # placeholder rows need filling before the plain int casts.
+    df["Year"] = df["Year"].fillna(-1).astype("int16")
+    df["Home Team Goals"] = df["Home Team Goals"].fillna(0).astype("int8")
+    df["Away Team Goals"] = df["Away Team Goals"].fillna(0).astype("int8")
+    # Kick-off times use abbreviated months ("13 Jul 1930 - 15:00") except for
+    # a few full month names; explicit formats skip per-value inference.
+    kickoff = df["Datetime"]
+    df["Datetime"] = pd.to_datetime(kickoff, format=KICKOFF_FORMAT, errors='coerce').fillna(
+        pd.to_datetime(kickoff, format=KICKOFF_FORMAT_FULL_MONTH, errors='coerce')
+    )
+    # Low-cardinality text columns: categorical codes make the repeated
+    # equality filters and groupbys in the callbacks much cheaper.
+    for col in MATCHES_CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    return df
+
+def prepare_players(df):
+    """Cleans the player events table and sets its categorical columns."""
+    df = clean_data_names(df)
+    for col in PLAYERS_CATEGORY_COLUMNS:
+        df[col] = df[col].astype("category")
+    return df
+
+def read_prepared_csv(csv_path, prepare, dtype=None):
+    """
+    Returns prepare(CSV) for a data file, cached as Parquet next to the CSV.
+
+    The cache is reused while it is newer than both the CSV and this module
+    (so edits to the cleaning code invalidate it). Without pyarrow, or when
+    the folder is read-only, it falls back to parsing the CSV every time.
+    An unreadable cache counts as a miss and is rewritten; writes go to a
+    temporary file that is swapped in whole, so readers never see a partial one.
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + ".parquet"
+    source_mtime = max(os.path.getmtime(csv_path), os.path.getmtime(__file__))
+    if os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= source_mtime:
+        try:
+            return pd.read_parquet(parquet_path, engine="pyarrow")
+        except ImportError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable cache {parquet_path}: {e}")
+
+    try:
+        # pyarrow's multithreaded parser; the C engine is the fallback
+        raw = pd.read_csv(csv_path, encoding="utf-8-sig", dtype=dtype, engine="pyarrow")
+    except ImportError:
+        raw = pd.read_csv(csv_path, encoding="utf-8-sig", dtype=dtype)
+    df = prepare(raw)
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(parquet_path), suffix=".tmp.parquet")
+        os.close(fd)
+        try:
+            df.to_parquet(tmp_path, engine="pyarrow", compression="zstd")
+            os.replace(tmp_path, parquet_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"Could not write cache {parquet_path}: {e}")
+    return df
+
+# (file name, prepare function, read_csv dtypes), in load_world_cup_data's return order
+WORLD_CUP_FILES = (
+    ("WorldCups.csv", prepare_overview, OVERVIEW_DTYPES),
+    ("WorldCupMatches.csv", prepare_matches, MATCHES_DTYPES),
+    ("WorldCupPlayers.csv", prepare_players, None),
+)
+
 def load_world_cup_data(folder_name="data"):
     """
-    Loads World Cup overview, matches, and players data from CSV files.
+    Loads World Cup overview, matches, and players data from CSV files
+    (via their Parquet caches when available).
+
+    Results are memoized on the files' modification times, so repeated
+    calls only stat the files; each caller gets its own copies.
 
     Args:
-        folder_name (str): The name of the folder where the CSV files are located.
+        folder_name (str): The name of the data folder, relative to this module.
 
     Returns:
         tuple: A tuple containing (world_cup_overview_df, matches_df, players_df, all_teams)
                or (None, None, None, None) if files cannot be loaded.
     """
-    base_path = os.path.join(os.getcwd(), folder_name)
-    
-    world_cup_overview_path = os.path.join(base_path, "WorldCups.csv")
-    matches_path = os.path.join(base_path, "WorldCupMatches.csv")
-    players_path = os.path.join(base_path, "WorldCupPlayers.csv")
-
-    # Initialize all return values to prevent UnboundLocalError
-    world_cup_overview_df, matches_df, players_df = None, None, None
-    all_teams = []
-
+    base_path = Path(__file__).resolve().parent / folder_name
+    mtimes = []
+    for file_name, _, _ in WORLD_CUP_FILES:
+        try:
+            mtimes.append((base_path / file_name).stat().st_mtime)
+        except OSError:
+            mtimes.append(None)
+    # Errors are reported here rather than inside the cached loader, so a
+    # failed load is never memoized and the next call retries.
     try:
-        if os.path.exists(world_cup_overview_path):
-            world_cup_overview_df = pd.read_csv(world_cup_overview_path, encoding="utf-8-sig")
-            world_cup_overview_df = clean_data_names(world_cup_overview_df)
-            world_cup_overview_df["Year"] = pd.to_numeric(world_cup_overview_df["Year"], errors='coerce').dropna().astype(int)
-            print(f"Loaded WorldCups.csv with {len(world_cup_overview_df)} rows.")
-        else:
-            print(f"Error: WorldCups.csv not found at {world_cup_overview_path}")
-
-        if os.path.exists(matches_path):
-            matches_df = pd.read_csv(matches_path, encoding="utf-8-sig")
-            matches_df.drop_duplicates(subset='MatchID', keep='first', inplace=True)
-            matches_df = clean_data_names(matches_df)
-            matches_df["Year"] = pd.to_numeric(matches_df["Year"], errors='coerce').fillna(-1).astype(int)
-            matches_df["Datetime"] = pd.to_datetime(matches_df["Datetime"], errors='coerce')
-            matches_df["Home Team Goals"] = pd.to_numeric(matches_df["Home Team Goals"], errors='coerce').fillna(0).astype(int)
-            matches_df["Away Team Goals"] = pd.to_numeric(matches_df["Away Team Goals"], errors='coerce').fillna(0).astype(int)
-            all_teams = pd.concat([matches_df['Home Team Name'], matches_df['Away Team Name']]).dropna().unique()
-            print(f"Loaded WorldCupMatches.csv with {len(matches_df)} rows.")
-        else:
-            print(f"Error: WorldCupMatches.csv not found at {matches_path}")
-
-        if os.path.exists(players_path):
-            players_df = pd.read_csv(players_path, encoding="utf-8-sig")
-            players_df = clean_data_names(players_df)
-            print(f"Loaded WorldCupPlayers.csv with {len(players_df)} rows.")
-        else:
-            print(f"Error: WorldCupPlayers.csv not found at {players_path}")
-            
+        loaded = load_world_cup_files(base_path, tuple(mtimes))
     except Exception as e:
         print(f"An error occurred while loading World Cup data: {e}")
         return None, None, None, None
+    return tuple(None if data is None else data.copy() for data in loaded)
+
+@lru_cache(maxsize=4)
+def load_world_cup_files(base_path, mtimes):
+    """Reads the data files; the mtimes (None if missing) also key the cache. Raises on failure."""
+    frames = []
+    for (file_name, prepare, dtype), mtime in zip(WORLD_CUP_FILES, mtimes):
+        path = base_path / file_name
+        if mtime is None:
+            print(f"Error: {file_name} not found at {path}")
+            frames.append(None)
+            continue
+        df = read_prepared_csv(path, prepare, dtype)
+        print(f"Loaded {file_name} with {len(df)} rows.")
+        frames.append(df)
+
+    world_cup_overview_df, matches_df, players_df = frames
+    all_teams = []
+    if matches_df is not None:
+        # Column-major ravel keeps the home-then-away order without a concat
+        team_names = matches_df[['Home Team Name', 'Away Team Name']].to_numpy().ravel(order='F')
+        all_teams = pd.unique(team_names[pd.notna(team_names)])
 
     return world_cup_overview_df, matches_df, players_df, all_teams
 
@@ -189,5 +317,9 @@ COUNTRY_TO_CONTINENT = {
 }
 
 def add_continent_column(df: pd.DataFrame) -> pd.DataFrame:
-    df['Continent'] = df['Country'].map(COUNTRY_TO_CONTINENT)
+    # Look up each distinct country once and broadcast back by category code
+    country = df['Country'].astype('category')
+    codes = country.cat.codes.to_numpy()
+    continents = country.cat.categories.map(COUNTRY_TO_CONTINENT).to_numpy(dtype=object)
+    df['Continent'] = pd.Series(continents[codes], index=df.index).where(codes >= 0)
     return df
\ No newline at end of file